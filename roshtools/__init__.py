@@ -1,4 +1,4 @@
 from .strings import slugify, camel_to_snake
-from .files import read_file, write_file
+from .files import read_file, read_file_chunks, write_file
 from .timers import timer
-from .net import get_json
+from .net import get_json, get_json_many
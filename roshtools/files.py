@@ -1,7 +1,59 @@
-from pathlib import Path
+import codecs
+import io
+import os
+from typing import Iterator
+
+_CHUNK_SIZE = 128 * 1024
+_O_BINARY = getattr(os, "O_BINARY", 0)  # Windows only; 0 elsewhere
 
 def read_file(path: str) -> str:
-    return Path(path).read_text(encoding="utf-8")
+    # One os.read sized from fstat instead of the open()/BufferedReader/TextIOWrapper stack.
+    fd = os.open(path, os.O_RDONLY | _O_BINARY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size) if size else b""
+        if len(data) < size or not size:
+            # Short read (very large file) or size not reported (e.g. /proc): read to EOF.
+            chunks = [data]
+            while True:
+                chunk = os.read(fd, _CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            data = b"".join(chunks)
+    finally:
+        os.close(fd)
+    # Match read_text's universal-newline handling
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def read_file_chunks(path: str, chunk_size: int = _CHUNK_SIZE) -> Iterator[str]:
+    """Yield the decoded text of a file in chunks, for files too big to hold in memory."""
+    # Incremental decoding keeps multi-byte characters and \r\n pairs intact across chunk boundaries
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(), translate=True)
+    with open(path, "rb", buffering=0) as f:  # we already read in chunk_size blocks
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
 
 def write_file(path: str, content: str) -> None:
-    Path(path).write_text(content, encoding="utf-8")
+    # Encode once and hand the bytes straight to os.write, skipping TextIOWrapper buffering.
+    if os.linesep != "\n":
+        content = content.replace("\n", os.linesep)  # match write_text's newline translation
+    data = memoryview(content.encode("utf-8"))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o666)
+    try:
+        while data:
+            n = os.write(fd, data)
+            data = data[n:]
+    finally:
+        os.close(fd)
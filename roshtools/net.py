@@ -1,7 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
+
+_session: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    """Return the shared, lazily created Session (pooled keep-alive connections)."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=100)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _session = session
+    return _session
+
 
-def get_json(url: str):
-    """Fetch JSON from a URL (simple wrapper)."""
-    resp = requests.get(url)
+def get_json(url: str, timeout: float = 30, session: Optional[requests.Session] = None):
+    """Fetch JSON from a URL (simple wrapper).
+
+    Reuses a module-level Session so repeated calls to the same host skip
+    the TCP/TLS handshake. Pass ``session`` to use your own instead.
+    """
+    resp = (session or _get_session()).get(url, timeout=timeout)
     resp.raise_for_status()
     return resp.json()
+
+
+def get_json_many(
+    urls: List[str],
+    timeout: float = 30,
+    max_workers: int = 32,
+    session: Optional[requests.Session] = None,
+) -> List[Any]:
+    """Fetch JSON from many URLs concurrently.
+
+    Requests run on a thread pool sharing one pooled Session, so round trips
+    overlap instead of adding up. Results come back in the same order as
+    ``urls``; the first failing request raises.
+    """
+    if not urls:
+        return []
+    session = session or _get_session()
+    workers = max(1, min(max_workers, len(urls)))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(lambda u: get_json(u, timeout=timeout, session=session), urls))
@@ -1,11 +1,18 @@
+import re
+
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+_CAMEL_RE = re.compile(r'(?<!^)(?=[A-Z])')
+# Maps every ASCII char outside [a-z0-9] to '-' (input is lowercased first)
+_SLUG_TBL = str.maketrans({c: '-' for c in map(chr, range(128)) if not ('a' <= c <= 'z' or '0' <= c <= '9')})
+
 def slugify(text: str) -> str:
     """Convert text into a URL-friendly slug."""
-    import re
     text = text.lower()
-    text = re.sub(r'[^a-z0-9]+', '-', text).strip('-')
-    return text
+    if not text.isascii():
+        return _SLUG_RE.sub('-', text).strip('-')
+    # Fast path: table translate, then split/join collapses runs and trims the edges
+    return '-'.join(filter(None, text.translate(_SLUG_TBL).split('-')))
 
 def camel_to_snake(name: str) -> str:
     """Convert CamelCase to snake_case."""
-    import re
-    return re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()
+    return _CAMEL_RE.sub('_', name).lower()
@@ -1,11 +1,45 @@
+import os
 import time
 import math
 import gc
+import sys
 from contextlib import contextmanager
 from functools import wraps
-from typing import Callable, Any, List, Tuple, Dict, Optional
+from typing import Callable, Any, List, Tuple, Dict, Optional, TextIO
 from dataclasses import dataclass
 
+# numpy is optional and only imported on the first complexity fit, so plain
+# `import roshtools` stays cheap; None = not tried yet, False = not installed
+_np: Any = None
+
+
+def _load_numpy():
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = False
+    return _np or None
+
+
+def _is_ndarray(a: Any) -> bool:
+    # an ndarray can only exist if someone already imported numpy
+    np = sys.modules.get("numpy")
+    return np is not None and isinstance(a, np.ndarray)
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+# ROSHTOOLS_TIMER=0 turns every timer into a no-op (read once at import)
+_ENABLED = os.environ.get("ROSHTOOLS_TIMER", "1") != "0"
+
+# Argument types we can len() and slice without probing; checked with one isinstance call
+_SIZED_TYPES = (list, tuple, bytes, bytearray, str)
+
 
 @dataclass
 class TimingInfo:
@@ -31,6 +65,16 @@ class timer:
         def f(data): ...
         info = f(big_list)
         print(info.seconds, info.complexity)
+
+    Set ROSHTOOLS_TIMER=0 in the environment to disable all timing: the
+    context manager does nothing and decorated functions return
+    (result, 0.0, None) without being measured.
+
+    Pass record=True to collect timings instead of printing them, then
+    write them all at once with flush():
+        t = timer("Hot", record=True)
+        ...
+        t.flush()
     """
 
     def __init__(
@@ -40,80 +84,191 @@ class timer:
         samples: int = 7,
         min_time: float = 0.05,   # target timing per size (s), adaptively loops to reach this
         max_loops: int = 256,     # safety cap on inner repeats
-        print_result: bool = True # print timing/complexity to stdout
+        print_result: bool = True, # print timing/complexity to stdout
+        record: bool = False,     # buffer (label, func_name, elapsed_ns, complexity, warning) instead of printing
+        preserve_inputs: Optional[bool] = None,  # copy mutable inputs per sweep call; None = auto-detect
+        collect: bool = False,    # run gc.collect() before each timing (costly with many live objects)
     ):
         self.label = label
         self.analyze_complexity = analyze_complexity
         self.samples = max(3, samples)
-        self.min_time = max(0.0, min_time)
+        self.min_time = min_time  # property; keeps _min_time_ns in sync
         self.max_loops = max(1, max_loops)
         self.print_result = print_result
+        self.preserve_inputs = preserve_inputs
+        self.collect = collect
         self.elapsed: Optional[float] = None  # available after context exit
+        # per-entry stacks so nested `with t:` blocks on one instance restore correctly
+        self._starts_ns: List[int] = []
+        self._gc_states: List[bool] = []
+        self._records: Optional[List[Tuple[str, Optional[str], int, Optional[str], Optional[str]]]] = (
+            [] if record else None
+        )
+        # Cost (ns) of the perf_counter_ns() pair bracketing each sample; subtracted during analysis
+        self._timer_overhead_ns = self._calibrate_overhead() if analyze_complexity and _ENABLED else 0
+        # (func, input size) -> fitted complexity, so repeat calls skip the sweep
+        self._fit_cache: Dict[Tuple[Callable, int], str] = {}
+        # func -> whether it mutates its sized input (detected once, on its first sweep)
+        self._mutates: Dict[Callable, bool] = {}
+
+    @property
+    def min_time(self) -> float:
+        return self._min_time
+
+    @min_time.setter
+    def min_time(self, value: float) -> None:
+        self._min_time = max(0.0, value)
+        self._min_time_ns = int(self._min_time * 1e9)
 
     # ---------- Context manager ----------
     def __enter__(self):
-        self._start = time.perf_counter()
+        if not _ENABLED:
+            return self
+        # Keep the cyclic GC out of the timed block
+        if self.collect:
+            gc.collect()
+        self._gc_states.append(gc.isenabled())
+        gc.disable()
+        self._starts_ns.append(time.perf_counter_ns())
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        end = time.perf_counter()
-        self.elapsed = end - self._start
-        if self.print_result:
-            print(f"{self.label}: {self.elapsed:.6f} seconds")
+        if not _ENABLED:
+            return
+        end_ns = time.perf_counter_ns()
+        if self._gc_states.pop():
+            gc.enable()
+        elapsed_ns = end_ns - self._starts_ns.pop()
+        self.elapsed = elapsed_ns / 1e9  # integer diff, no FP cancellation
+        self._report(None, elapsed_ns)
 
     # ---------- Decorator ----------
     def __call__(self, func: Callable) -> Callable:
+        if not _ENABLED:
+            # Keep the (result, seconds, complexity) shape so callers don't break
+            @wraps(func)
+            def passthrough(*args, **kwargs) -> Tuple:
+                return func(*args, **kwargs), 0.0, None
+            return passthrough
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> Tuple:
-            # Single timing first (always)
-            start = time.perf_counter()
-            res = func(*args, **kwargs)
-            elapsed = time.perf_counter() - start
+            # Before the timed call: if a sweep will follow and func may mutate its input
+            # (unknown yet, or known to), keep a copy so the sweep sees the original data
+            snapshot = None
+            if self.analyze_complexity:
+                idx, base_len = self._find_sized_arg(args)
+                if (
+                    idx is not None
+                    and self.preserve_inputs is not False
+                    and self._mutates.get(func, True)
+                    and (func, base_len) not in self._fit_cache
+                ):
+                    snapshot = self._copy_arg(args[idx])
+
+            # Single timing first (always), shielded from GC pauses
+            if self.collect:
+                gc.collect()
+            gc_was_enabled = gc.isenabled()
+            try:
+                gc.disable()
+                start_ns = time.perf_counter_ns()
+                res = func(*args, **kwargs)
+                elapsed_ns = time.perf_counter_ns() - start_ns
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+            elapsed = elapsed_ns / 1e9
 
             if not self.analyze_complexity:
-                if self.print_result:
-                    print(f"{self.label} ({func.__name__}): {elapsed:.6f} seconds")
+                self._report(func.__name__, elapsed_ns)
                 return res, elapsed, "O(1)"
 
-            # ---- Complexity analysis (empirical, no numpy/sklearn) ----
-            # We’ll vary the size of the FIRST sliceable/len()-able argument.
-            idx, base_len = self._find_sized_arg(args)
-            if idx is None or base_len < self.samples:
+            # ---- Complexity analysis (empirical; numpy used for the fit if installed) ----
+            # We vary the size of the FIRST sliceable/len()-able argument (idx, found above).
+            # need `samples` distinct sizes >= 2 (log(1) would collapse onto n=2)
+            if idx is None or base_len < self.samples + 1:
                 # Can't analyze; fall back to time only
-                if self.print_result:
-                    print(f"{self.label} ({func.__name__}): {elapsed:.6f} seconds, ~ (size unknown)")
+                self._report(func.__name__, elapsed_ns, "(size unknown)")
                 return res, elapsed, "O(1)"
 
+            if snapshot is not None:
+                if func not in self._mutates:
+                    # one-time detection per function
+                    self._mutates[func] = snapshot is not args[idx] and not self._same_value(snapshot, args[idx])
+                if self._mutates[func]:
+                    # func changed its input (e.g. in-place sort): sweep over the original data
+                    args = args[:idx] + (snapshot,) + args[idx + 1:]
+            preserve = self.preserve_inputs
+            if preserve is None:
+                preserve = self._mutates.get(func, False)
+
+            cache_key = (func, base_len)
+            best_model = self._fit_cache.get(cache_key)
+            if best_model is not None:
+                self._report(func.__name__, elapsed_ns, best_model)
+                return res, elapsed, best_model
+
             sizes = self._geometric_sizes(base_len, self.samples)
 
             # Warm-up run (outside timing) to stabilize
             try:
-                _ = func(*self._resize_args(args, idx, sizes[0]), **kwargs)
+                warm_args = self._resize_args(args, idx, sizes[0])
+                _ = func(*([self._copy_arg(a) for a in warm_args] if preserve else warm_args), **kwargs)
             except Exception:
                 pass  # ignore failures during warmup; user function may rely on full size
 
-            per_call_times: List[float] = []
+            per_call_ns: List[float] = []
+            overhead_ratio = 0.0
             gc_was_enabled = gc.isenabled()
             try:
                 gc.disable()
                 for n in sizes:
                     # Adaptively repeat to reach min_time for better signal/noise
                     loops = 1
-                    total = 0.0
                     resized = self._resize_args(args, idx, n)
-                    while total < self.min_time and loops <= self.max_loops:
-                        t0 = time.perf_counter()
-                        for _ in range(loops):
-                            func(*resized, **kwargs)
-                        total = time.perf_counter() - t0
-                        if total < self.min_time:
-                            loops *= 2
-                    per_call = total / max(1, loops)
-                    per_call_times.append(per_call)
+                    while True:
+                        if preserve:
+                            # fresh copies each call so in-place mutation can't skew later runs;
+                            # each call is timed on its own so the O(n) copy stays untimed.
+                            # A big copy still leaves caches cold for whatever runs next, so
+                            # the same copy + timed call of a no-op gives the baseline to subtract.
+                            total_ns = 0
+                            baseline_ns = 0
+                            for _ in range(loops):
+                                fresh = [self._copy_arg(a) for a in resized]
+                                t0 = time.perf_counter_ns()
+                                func(*fresh, **kwargs)
+                                total_ns += time.perf_counter_ns() - t0
+                                fresh = [self._copy_arg(a) for a in resized]
+                                t0 = time.perf_counter_ns()
+                                _noop(*fresh, **kwargs)
+                                baseline_ns += time.perf_counter_ns() - t0
+                        else:
+                            t0 = time.perf_counter_ns()
+                            for _ in range(loops):
+                                func(*resized, **kwargs)
+                            total_ns = time.perf_counter_ns() - t0
+                        if total_ns >= self._min_time_ns or loops * 2 > self.max_loops:
+                            break
+                        loops *= 2
+                    # measured copy/call baseline when preserving, one timer pair per batch otherwise
+                    overhead_ns = baseline_ns if preserve else self._timer_overhead_ns
+                    per_call = max(0, total_ns - overhead_ns) / loops
+                    if per_call > 0:
+                        overhead_ratio = max(overhead_ratio, overhead_ns / loops / per_call)
+                    else:
+                        overhead_ratio = math.inf  # nothing left after subtracting overhead
+                    per_call_ns.append(per_call)
             finally:
                 if gc_was_enabled:
                     gc.enable()
 
+            warning = None
+            if overhead_ratio > 0.10:
+                share = "over 100%" if overhead_ratio >= 1 else f"{overhead_ratio:.0%}"
+                warning = f"timer overhead is {share} of measured time; complexity estimate may be unreliable"
+
             # Fit against candidate models (with intercept)
             candidates = {
                 "O(1)":              lambda x: 1.0,
@@ -129,25 +284,94 @@ class timer:
             # Avoid log(0)
             safe_sizes = [max(2, s) for s in sizes]
 
-            errors: Dict[str, float] = {}
-            for name, f in candidates.items():
-                xs = [f(s) for s in safe_sizes]
-                a, b = self._linreg(xs, per_call_times)  # y ≈ a + b*x
-                rmse = self._rmse(xs, per_call_times, a, b)
-                errors[name] = rmse
+            per_call_times = [t / 1e9 for t in per_call_ns]
+            # Only fit the models near the observed log-log growth rate
+            names = self._plausible_models(
+                list(candidates), safe_sizes, per_call_times, noise_floor=self._timer_overhead_ns / 1e9
+            )
+            candidates = {name: candidates[name] for name in names}
+            errors = self._fit_models(candidates, safe_sizes, per_call_times)
 
             # Choose best model by lowest RMSE
             best_model = min(errors, key=errors.get)
-            if self.print_result:
-                print(f"{self.label} ({func.__name__}): {elapsed:.6f} seconds, ~ {best_model}")
+            self._fit_cache[cache_key] = best_model
+            self._report(func.__name__, elapsed_ns, best_model, warning)
 
             return res, elapsed, best_model
         return wrapper
 
+    # ---------- Output ----------
+    def _report(
+        self,
+        func_name: Optional[str],
+        elapsed_ns: int,
+        complexity: Optional[str] = None,
+        warning: Optional[str] = None,
+    ) -> None:
+        if self._records is not None:
+            self._records.append((self.label, func_name, elapsed_ns, complexity, warning))
+        elif self.print_result:
+            print(self._format_line(self.label, func_name, elapsed_ns, complexity))
+            if warning is not None:
+                print(self._format_warning(self.label, func_name, warning), file=sys.stderr)
+
+    @staticmethod
+    def _format_line(label: str, func_name: Optional[str], elapsed_ns: int, complexity: Optional[str]) -> str:
+        name = f" ({func_name})" if func_name is not None else ""
+        suffix = f", ~ {complexity}" if complexity is not None else ""
+        return f"{label}{name}: {elapsed_ns / 1e9:.6f} seconds{suffix}"
+
+    @staticmethod
+    def _format_warning(label: str, func_name: Optional[str], warning: str) -> str:
+        name = f" ({func_name})" if func_name is not None else ""
+        return f"WARN {label}{name}: {warning}"
+
+    def flush(self, stream: Optional[TextIO] = None) -> None:
+        """Write buffered records (record=True) in one go and clear them.
+
+        Timings go to ``stream`` (stdout by default); WARN lines go to stderr,
+        as they do when printing directly.
+        """
+        if not self._records:
+            return
+        stream = stream if stream is not None else sys.stdout
+        stream.write("".join(self._format_line(*r[:4]) + "\n" for r in self._records))
+        warnings = [self._format_warning(r[0], r[1], r[4]) + "\n" for r in self._records if r[4] is not None]
+        if warnings:
+            sys.stderr.write("".join(warnings))
+        self._records.clear()
+
+    def clear_cache(self) -> None:
+        """Forget cached complexity fits so the next call re-runs the sweep."""
+        self._fit_cache.clear()
+
     # ---------- helpers ----------
+    @staticmethod
+    def _calibrate_overhead(rounds: int = 1000) -> int:
+        # median cost (ns) of two back-to-back perf_counter_ns() calls
+        deltas = []
+        for _ in range(rounds):
+            t0 = time.perf_counter_ns()
+            t1 = time.perf_counter_ns()
+            deltas.append(t1 - t0)
+        deltas.sort()
+        return deltas[len(deltas) // 2]
+
     @staticmethod
     def _find_sized_arg(args: tuple):
         for i, a in enumerate(args):
+            if isinstance(a, _SIZED_TYPES):
+                return i, len(a)
+            if _is_ndarray(a):
+                if a.ndim > 0:  # 0-d arrays have no len()
+                    return i, len(a)
+                continue
+            # Support integer input for scaling tests
+            if isinstance(a, int):
+                if a > 0:
+                    return i, a
+                continue
+            # Exotic containers (e.g. pandas objects): probe for len() + slicing
             if hasattr(a, "__len__") and hasattr(a, "__getitem__"):
                 try:
                     n = len(a)
@@ -155,37 +379,121 @@ class timer:
                     return i, n
                 except Exception:
                     continue
-            # Support integer input for scaling tests
-            elif isinstance(a, int) and a > 0:
-                return i, a
         return None, None
 
     @staticmethod
     def _geometric_sizes(max_n: int, samples: int) -> List[int]:
-        # geometric schedule from roughly max_n / 2^(samples-1) up to max_n
+        # geometric schedule from 2 up to max_n, strictly increasing, single pass;
+        # callers guarantee max_n >= samples + 1 so every size stays >= 2
+        ratio = (max_n / 2) ** (1 / (samples - 1)) if max_n > 2 else 1.0
         sizes = []
-        factor = (max_n / 2) ** (1 / (samples - 1))
-        val = max(2, int(max_n / 2))
-        for _ in range(samples - 1):
-            sizes.append(min(max_n, int(val)))
-            val *= factor
-        sizes.append(max_n)
-        # ensure strictly increasing
-        sizes = sorted(list(set(sizes)))
-        while len(sizes) < samples:
-            sizes.append(max_n)
+        cur = 2.0
+        prev = 0
+        for _ in range(samples):
+            n = max(prev + 1, min(max_n, int(round(cur))))  # bump duplicates up by one
+            sizes.append(n)
+            prev = n
+            cur *= ratio
+        # bumping can push the tail past max_n; pull it back down from the top
+        top = max_n
+        for i in range(samples - 1, -1, -1):
+            if sizes[i] < top:
+                break
+            sizes[i] = max(2, top)
+            top -= 1
         return sizes
 
+    @staticmethod
+    def _copy_arg(a: Any) -> Any:
+        # shallow copy for common mutable containers; anything else passes through
+        if isinstance(a, list):
+            # a.copy() is exact-size, so the first append to it would pay an O(n) realloc
+            # inside the timed call; append+pop leaves the usual over-allocated headroom
+            c = a.copy()
+            c.append(None)
+            c.pop()
+            return c
+        if isinstance(a, (bytearray, dict, set)) or _is_ndarray(a):
+            return a.copy()
+        return a
+
+    @staticmethod
+    def _same_value(a: Any, b: Any) -> bool:
+        try:
+            if _is_ndarray(a):
+                return bool(sys.modules["numpy"].array_equal(a, b))
+            return bool(a == b)
+        except Exception:
+            return True  # can't compare; assume unchanged
+
     @staticmethod
     def _resize_args(args: Tuple[Any, ...], idx: int, n: int) -> Tuple[Any, ...]:
         args = list(args)
         sized = args[idx]
+        if isinstance(sized, int):
+            args[idx] = n  # integer "size" argument: pass the sample size itself
+            return tuple(args)
         try:
             args[idx] = sized[:n] if hasattr(sized, "__getitem__") else sized
         except Exception:
             args[idx] = sized
         return tuple(args)
 
+    # rough log-log slope of each candidate, in the same order as the candidates dict
+    _MODEL_SLOPES = (0.0, 0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0)
+
+    @classmethod
+    def _plausible_models(
+        cls, names: List[str], sizes: List[int], times: List[float], noise_floor: float = 0.0
+    ) -> List[str]:
+        # Pick the model whose slope is closest to the log-log growth rate and keep its
+        # neighbours either side. The final fit has an intercept, so a fixed per-call
+        # cost must not flatten the slope: it is taken from the growth over the
+        # smallest-size time, using only points that grew by more than 10% of it and by
+        # more than `noise_floor` (s) (smaller differences are noise). With fewer than two such points the timings
+        # are flat: the raw slope is used, or, when times were swamped by overhead and
+        # can't be logged, only the flat models are kept.
+        if len(names) != len(cls._MODEL_SLOPES):
+            return names
+        base = times[0]
+        threshold = max(0.1 * base, noise_floor)
+        grown = [(s, t - base) for s, t in zip(sizes[1:], times[1:]) if t - base > threshold]
+        if len(grown) >= 2:
+            xs, ys = [s for s, _ in grown], [g for _, g in grown]
+        elif min(times) > 0:
+            xs, ys = sizes, times
+        else:
+            return names[:2]
+        _, slope = cls._linreg([math.log(s) for s in xs], [math.log(t) for t in ys])
+        nearest = min(range(len(names)), key=lambda i: abs(cls._MODEL_SLOPES[i] - slope))
+        return names[max(0, nearest - 1):nearest + 2]
+
+    @classmethod
+    def _fit_models(
+        cls, candidates: Dict[str, Callable], sizes: List[int], times: List[float]
+    ) -> Dict[str, float]:
+        # RMSE of y ≈ a + b*f(n) for every candidate f
+        np = _load_numpy()
+        if np is None:
+            errors: Dict[str, float] = {}
+            for name, f in candidates.items():
+                xs = [f(s) for s in sizes]
+                a, b = cls._linreg(xs, times)
+                errors[name] = cls._rmse(xs, times, a, b)
+            return errors
+
+        # All candidates at once: one row per model, closed-form fit along each row
+        x = np.array([[f(s) for s in sizes] for f in candidates.values()], dtype=np.float64)
+        y = np.asarray(times, dtype=np.float64)
+        dx = x - x.mean(axis=1, keepdims=True)
+        den = (dx * dx).sum(axis=1)
+        num = (dx * (y - y.mean())).sum(axis=1)
+        b = np.divide(num, den, out=np.zeros_like(num), where=den != 0)
+        a = y.mean() - b * x.mean(axis=1)
+        resid = y - (a[:, None] + b[:, None] * x)
+        rmse = np.sqrt((resid * resid).mean(axis=1))
+        return {name: float(e) for name, e in zip(candidates, rmse)}
+
     @staticmethod
     def _linreg(x: List[float], y: List[float]) -> Tuple[float, float]:
         # simple linear regression with intercept: y ≈ a + b*x